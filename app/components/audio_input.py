@@ -1,5 +1,9 @@
+import io
 import streamlit as st
 
+TARGET_SAMPLE_RATE = 16000  # Speech recognition runs at 16 kHz mono internally
+DOWNSAMPLE_MIN_BYTES = 1024 * 1024  # Clips smaller than this are uploaded as-is
+
 
 def audio_input():
     # Check if we already stored a recording in session_state.
@@ -27,4 +31,41 @@ def upload_audio():
         audio_bytes = uploaded_file.read()
         return audio_bytes, uploaded_file.name
     else:
-        return None, None
\ No newline at end of file
+        return None, None
+
+def downsample_audio(audio_data, file_name, min_bytes=DOWNSAMPLE_MIN_BYTES):
+    """
+    Downmixes and resamples a WAV recording to 16 kHz mono 16-bit PCM to shrink the upload.
+    Small clips, non-WAV files and WAVs that cannot be decoded are returned unchanged.
+    """
+    size = len(audio_data.getbuffer()) if hasattr(audio_data, "getbuffer") else len(audio_data)
+    if not file_name.endswith(".wav") or size < min_bytes:
+        return audio_data, file_name
+
+    import numpy as np
+    import scipy.signal as sps
+    import soundfile as sf
+
+    source = io.BytesIO(audio_data) if isinstance(audio_data, bytes) else audio_data
+    source.seek(0)
+    try:
+        info = sf.info(source)
+        source.seek(0)
+        if info.channels == 1 and info.samplerate == TARGET_SAMPLE_RATE:
+            return audio_data, file_name
+
+        data, sample_rate = sf.read(source, dtype="float32")
+    except sf.SoundFileError:
+        # Let the backend handle WAV variants libsndfile cannot parse
+        source.seek(0)
+        return audio_data, file_name
+
+    if data.ndim == 2:
+        data = data.mean(axis=1)
+    if sample_rate != TARGET_SAMPLE_RATE:
+        data = sps.resample_poly(data, TARGET_SAMPLE_RATE, sample_rate)
+
+    buf = io.BytesIO()
+    sf.write(buf, np.clip(data, -1.0, 1.0), TARGET_SAMPLE_RATE, format="WAV", subtype="PCM_16")
+    buf.seek(0)
+    return buf, file_name
@@ -1,15 +1,17 @@
-import requests
-from utils.config import API_BASE_URL
+from utils.http import client
 
 def transcribe_audio(audio_data, file_name):
     """
     Calls the transcription API with the given audio file.
+    `audio_data` may be raw bytes or a file-like buffer, which is streamed as-is.
     """
-    url = f"{API_BASE_URL}/transcribe/"
+    if hasattr(audio_data, "seek"):
+        audio_data.seek(0)
+
     files = {"file": (file_name, audio_data, "audio/mp3" if file_name.endswith(".mp3") else "audio/wav")}
     
     try:
-        response = requests.post(url, files=files)
+        response = client().post("/transcribe/", files=files)
         response.raise_for_status()
 
         # print("API Response:", response.json()) 
@@ -1,11 +1,9 @@
-import requests
-from utils.config import API_BASE_URL
+from utils.http import client
 
 def translate_transcript(transcript, source_lang, target_lang):
     """
     Calls the translation API with the given transcript and language options.
     """
-    url = f"{API_BASE_URL}/translate/"
     data = {
         "text": transcript,
         "source_lang": source_lang,
@@ -13,7 +11,7 @@ def translate_transcript(transcript, source_lang, target_lang):
     }
     
     try:
-        response = requests.post(url, json=data)
+        response = client().post("/translate/", json=data)
         response.raise_for_status()
         translation = response.json().get("translation", "")
         return translation
@@ -1,184 +1,351 @@
 import streamlit as st
-from components.audio_input import audio_input, upload_audio
+from components.audio_input import audio_input, upload_audio, downsample_audio
 from components.transcription import transcribe_audio
 from components.translation import translate_transcript
-from gtts import gTTS
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils.config import CACHE_DIR, CACHE_SIZE_LIMIT, CACHE_EXPIRE
+import diskcache
+import hashlib
+import io
+import re
+
+# Supported languages mapped to their gTTS language codes
+LANG_CODES = {
+    "English": "en",
+    "Urdu": "ur",
+    "Spanish": "es",
+    "French": "fr",
+    "German": "de",
+    "Italian": "it",
+    "Japanese": "ja",
+    "Korean": "ko",
+    "Portuguese": "pt",
+    "Russian": "ru",
+    "Chinese": "zh-CN",
+}
+
+# Languages whose sentences are not separated by spaces
+NO_SPACE_LANGS = {"Chinese", "Japanese"}
+
+# ================== Cached Helpers ==================
+@st.cache_resource(show_spinner=False)
+def _kv():
+    """
+    Opens the on-disk cache shared by all sessions, which survives app restarts.
+    """
+    return diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT, eviction_policy="least-recently-used")
+
+def _cache_key(namespace, *parts):
+    return hashlib.sha1("|".join((namespace, *parts)).encode()).hexdigest()
+
+def _synthesize(text, lang_code):
+    """
+    Converts text to speech with gTTS and returns the MP3 bytes.
+    """
+    key = _cache_key("tts", text, lang_code)
+    cache = _kv()
+    mp3_bytes = cache.get(key)
+    if mp3_bytes is None:
+        from gtts import gTTS  # Imported lazily so reruns that never speak skip loading gTTS
+
+        buf = io.BytesIO()
+        gTTS(text=text, lang=lang_code).write_to_fp(buf)
+        mp3_bytes = buf.getvalue()
+        cache.set(key, mp3_bytes, expire=CACHE_EXPIRE)
+    return mp3_bytes
+
+@st.cache_resource(show_spinner=False)
+def _load_image(path):
+    """
+    Reads an image file once and hands the same bytes object to later reruns,
+    without the per-call copy st.cache_data would make.
+    """
+    with open(path, "rb") as file:
+        return file.read()
+
+def _split_with_separators(text):
+    """
+    Splits text on sentence-ending punctuation (including CJK full stops) and
+    returns the sentences together with the whitespace that followed each one.
+    """
+    parts = re.split(r"((?<=[.!?])\s+|(?<=[。！？])\s*)", text)
+    sentences, separators = parts[0::2], parts[1::2] + [""]
+    if len(sentences) > 1 and not sentences[-1]:
+        # A trailing CJK full stop leaves an empty sentence behind
+        sentences.pop()
+        separators.pop()
+    return sentences, separators
+
+def _split_sentences(text):
+    """
+    Splits text on sentence-ending punctuation (including CJK full stops).
+    """
+    sentences = [s.strip() for s in _split_with_separators(text)[0] if s.strip()]
+    return sentences or [text]
+
+def _is_translation_error(translation):
+    return translation.startswith("Error during translation")
+
+def _cached_translate(text, src, tgt):
+    """
+    Translates text, reusing the result for repeated (text, src, tgt) inputs.
+    """
+    key = _cache_key("translate", text, src, tgt)
+    cache = _kv()
+    translation = cache.get(key)
+    if translation is None:
+        translation = translate_transcript(text, src, tgt)
+        # Do not persist failures, so the next attempt retries the API
+        if not _is_translation_error(translation):
+            cache.set(key, translation, expire=CACHE_EXPIRE)
+    return translation
+
+def _executor(max_workers):
+    """
+    Creates a short-lived thread pool whose workers share the current script run
+    context. Only use it as a `with` block inside the current run.
+    """
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx(suppress_warning=True)),
+    )
+
+@st.cache_resource(show_spinner=False)
+def _background_pool():
+    """
+    Returns the process-wide pool used for background translations. Its workers
+    carry no script run context, so they must not call st.* elements.
+    """
+    return ThreadPoolExecutor(max_workers=4)
+
+def _translate_chunked(text, src, tgt, sentences_per_chunk=4):
+    """
+    Translates groups of sentences in parallel so long transcripts take about
+    as long as their slowest chunk. Each chunk is cached on its own, so edits
+    only re-translate the chunks that changed. Line breaks between chunks are
+    kept, and a RuntimeError is raised if any chunk fails to translate.
+    """
+    sentences, separators = _split_with_separators(text)
+    chunks, joiners = [], []
+    for i in range(0, len(sentences), sentences_per_chunk):
+        end = min(i + sentences_per_chunk, len(sentences))
+        chunks.append("".join(sentences[j] + separators[j] for j in range(i, end - 1)) + sentences[end - 1])
+        joiners.append(_chunk_joiner(separators[end - 1], tgt) if end < len(sentences) else "")
+
+    with _executor(min(8, len(chunks))) as pool:
+        parts = list(pool.map(lambda chunk: _cached_translate(chunk, src, tgt) if chunk.strip() else chunk, chunks))
+
+    for part in parts:
+        if _is_translation_error(part):
+            raise RuntimeError(part)
+    return "".join(part + joiner for part, joiner in zip(parts, joiners))
+
+def _chunk_joiner(separator, tgt):
+    """
+    Keeps line breaks between chunks as they were, and otherwise uses the
+    target language's spacing (Chinese and Japanese do not put spaces between
+    sentences).
+    """
+    if "\n" in separator:
+        return separator
+    return "" if tgt in NO_SPACE_LANGS else " "
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_transcribe(audio_hash, file_name, _audio_data):
+    """
+    Transcribes audio, reusing the result when the same recording is submitted again.
+    The cache is keyed on `audio_hash` so Streamlit does not copy the buffer to hash it.
+    Failures are raised instead of returned so st.cache_data does not keep them.
+    """
+    _audio_data, file_name = downsample_audio(_audio_data, file_name)
+    result = transcribe_audio(_audio_data, file_name)
+    if isinstance(result, str):
+        raise RuntimeError(result)
+    return result
 
 st.title("Healthcare Translation Web App with Generative AI")
 
-with st.expander("Project Description"):
-    st.markdown("""
-    # Healthcare Translation Web App 🏥
-
-    A FastAPI and Streamlit–based application that provides real-time medical transcription and translation services.
-
-    ## Features 🌟
-
-    - **Audio Input & Processing**
-    - Real-time voice recording via microphone
-    - Support for both WAV and MP3 file uploads
-    - Chunked audio processing for long recordings
-    - Audio duration validation
-
-    - **Transcription Capabilities**
-    - Speech-to-text conversion with real-time feedback
-    - Medical terminology validation
-    - Grammar and punctuation correction
-    - Support for multiple audio formats
-
-    - **Translation Services**
-    - Multi-language support (11+ languages)
-    - Medical context–aware translations
-    - Real-time translation processing
-    - Customizable source and target language selection
-
-    - **Audio Output**
-    - Text-to-speech conversion for translated text
-    - Downloadable translated audio
-    - Audio playback controls
-    - Support for multiple accents
-
-    - **User Interface**
-    - Mobile-responsive design
-    - Dual transcript display (original and corrected)
-    - Real-time processing indicators
-    - Intuitive language selection
-
-    ## Architecture 🏗️
-    """)
+# ================== Project Description ==================
+# The fragment still runs on every full rerun; it only isolates reruns
+# triggered from inside it. The cached images are what saves work.
+@st.fragment
+def _render_description():
+    with st.expander("Project Description"):
+        st.markdown("""
+        # Healthcare Translation Web App 🏥
+
+        A FastAPI and Streamlit–based application that provides real-time medical transcription and translation services.
+
+        ## Features 🌟
+
+        - **Audio Input & Processing**
+        - Real-time voice recording via microphone
+        - Support for both WAV and MP3 file uploads
+        - Chunked audio processing for long recordings
+        - Audio duration validation
+
+        - **Transcription Capabilities**
+        - Speech-to-text conversion with real-time feedback
+        - Medical terminology validation
+        - Grammar and punctuation correction
+        - Support for multiple audio formats
+
+        - **Translation Services**
+        - Multi-language support (11+ languages)
+        - Medical context–aware translations
+        - Real-time translation processing
+        - Customizable source and target language selection
+
+        - **Audio Output**
+        - Text-to-speech conversion for translated text
+        - Downloadable translated audio
+        - Audio playback controls
+        - Support for multiple accents
+
+        - **User Interface**
+        - Mobile-responsive design
+        - Dual transcript display (original and corrected)
+        - Real-time processing indicators
+        - Intuitive language selection
+
+        ## Architecture 🏗️
+        """)
     
-    st.image("screenshots/a_diagram.png", caption="Architecture Diagram")
-    st.markdown("""
-    ## Tech Stack 🛠️
-
-    - **Backend Framework**: FastAPI
-    - **AI Services**: 
-    - Google Speech Recognition
-    - Google Gemini AI
-    - **Audio Processing**: pydub
-    - **Frontend: Streamlit**: Streamlit
-    - **Environment**: Python 3.8+
-
-    ## Project Structure 📁
-
-    ```
-    healthcare_translation_web_app/
-    ├── server/
-    │   ├── routes/
-    │   │   ├── transcribe.py      # Audio transcription endpoint
-    │   │   └── translate.py       # Translation endpoint
-    │   └── server.py              # Main server configuration
-    ├── streamlit_app/
-    │   ├── components/
-    │   │   ├── audio_input.py     # Audio input options (record/upload)
-    │   │   ├── transcription.py   # Calls transcription API
-    │   │   └── translation.py     # Calls translation API
-    │   ├── utils/
-    │   │   └── config.py          # Configuration constants (e.g., API_BASE_URL)
-    │   └── app.py                 # Main Streamlit app
-    ├── .env                       # Environment variables
-    └── README.md                  # Project documentation
-    ```
-
-    ## API Endpoints 🔌
-
-    ### Transcription
-
-    ```http
-    POST /transcribe/
-    ```
-
-    - Accepts WAV/MP3 audio files
-    - Returns original and corrected transcripts
-    - Handles medical terminology validation
-
-    ### Translation
-
-    ```http
-    POST /translate/
-    ```
-    - Accepts source language, target language, and text to be translated
-    - Returns the translated text
-
-    ## Setup & Installation 💻
-
-    1. Clone the repository:
-    ```bash
-    git clone https://github.com/usman619/healthcare_web_app
-    cd healthcare_web_app
-    ```
-
-    2. Install dependencies:
-    ```bash
-    pip install -r requirements.txt
-    ```
-
-    3. Install ffmpeg in conda or on your device
-    ```bash
-    conda install -c conda-forge ffmpeg
-    ```
-    ```bash
-    sudo apt-get update
-    sudo apt-get install ffmpeg
-    ```
-
-    4. Configure environment variables:
-    ```bash
-    cp .env.example .env
-    # Edit .env with your API keys
-    ```
-
-    5. Start the server:
-    ```bash
-    cd server
-    fastapi dev server.py
-    ```
-
-    6. Start the Streamlit app:
-    ```bash
-    cd ../streamlit_app
-    streamlit run app.py
-    ```
-
-    ## Environment Variables 🔐
-
-    Required environment variables in `.env`:
-    - `GEMINI_API_KEY`: Google Gemini AI API key
-    - `API_BASE_URL`: The base URL of your FastAPI server (including the port)
-
-    ## API Documentation 📚
-
-    Access the interactive API documentation:
-    - Swagger UI: `http://localhost:8000/docs`
-    - ReDoc: `http://localhost:8000/redoc`
-
-    ## Deployment 🖥️
-    **FastAPI code**: [healthcare_server](https://github.com/usman619/healthcare_server)
-    **Streamlit code**: [healthcare_streamlit](https://github.com/usman619/healthcare_streamlit)
-
-    **Streamlit frontend Link**: https://healthcare-translation-web-app.streamlit.app/
-
-    I have deployed this project using [Streamlit](https://streamlit.io/) for the frontend and [Railway](https://railway.com/) for the backend.
-
-    Streamlit deployment was simple and but I am having issues with `healthcare_server` deployment. I have tested it by creating docker image and testing it locally and that is working perfectly. The following are the deployment images on `railway.com` and 
-
-    - Railway server deployment:
-
-    """)   
-    st.image("screenshots/railway_deployment_1.png", caption="Railway server deployment")
-
-    st.markdown("- The main issue is `ffmpeg` not working correctly which is resulting in the APIs not working once deployed:")
-    st.image("screenshots/railway_deployment_2.png", caption="Railway server deployment")
+        st.image(_load_image("screenshots/a_diagram.png"), caption="Architecture Diagram")
+        st.markdown("""
+        ## Tech Stack 🛠️
+
+        - **Backend Framework**: FastAPI
+        - **AI Services**: 
+        - Google Speech Recognition
+        - Google Gemini AI
+        - **Audio Processing**: pydub
+        - **Frontend: Streamlit**: Streamlit
+        - **Environment**: Python 3.8+
+
+        ## Project Structure 📁
+
+        ```
+        healthcare_translation_web_app/
+        ├── server/
+        │   ├── routes/
+        │   │   ├── transcribe.py      # Audio transcription endpoint
+        │   │   └── translate.py       # Translation endpoint
+        │   └── server.py              # Main server configuration
+        ├── streamlit_app/
+        │   ├── components/
+        │   │   ├── audio_input.py     # Audio input options (record/upload)
+        │   │   ├── transcription.py   # Calls transcription API
+        │   │   └── translation.py     # Calls translation API
+        │   ├── utils/
+        │   │   └── config.py          # Configuration constants (e.g., API_BASE_URL)
+        │   └── app.py                 # Main Streamlit app
+        ├── .env                       # Environment variables
+        └── README.md                  # Project documentation
+        ```
+
+        ## API Endpoints 🔌
+
+        ### Transcription
+
+        ```http
+        POST /transcribe/
+        ```
+
+        - Accepts WAV/MP3 audio files
+        - Returns original and corrected transcripts
+        - Handles medical terminology validation
+
+        ### Translation
+
+        ```http
+        POST /translate/
+        ```
+        - Accepts source language, target language, and text to be translated
+        - Returns the translated text
+
+        ## Setup & Installation 💻
+
+        1. Clone the repository:
+        ```bash
+        git clone https://github.com/usman619/healthcare_web_app
+        cd healthcare_web_app
+        ```
+
+        2. Install dependencies:
+        ```bash
+        pip install -r requirements.txt
+        ```
+
+        3. Install ffmpeg in conda or on your device
+        ```bash
+        conda install -c conda-forge ffmpeg
+        ```
+        ```bash
+        sudo apt-get update
+        sudo apt-get install ffmpeg
+        ```
+
+        4. Configure environment variables:
+        ```bash
+        cp .env.example .env
+        # Edit .env with your API keys
+        ```
+
+        5. Start the server:
+        ```bash
+        cd server
+        fastapi dev server.py
+        ```
+
+        6. Start the Streamlit app:
+        ```bash
+        cd ../streamlit_app
+        streamlit run app.py
+        ```
+
+        ## Environment Variables 🔐
+
+        Required environment variables in `.env`:
+        - `GEMINI_API_KEY`: Google Gemini AI API key
+        - `API_BASE_URL`: The base URL of your FastAPI server (including the port)
+
+        ## API Documentation 📚
+
+        Access the interactive API documentation:
+        - Swagger UI: `http://localhost:8000/docs`
+        - ReDoc: `http://localhost:8000/redoc`
+
+        ## Deployment 🖥️
+        **FastAPI code**: [healthcare_server](https://github.com/usman619/healthcare_server)
+        **Streamlit code**: [healthcare_streamlit](https://github.com/usman619/healthcare_streamlit)
+
+        **Streamlit frontend Link**: https://healthcare-translation-web-app.streamlit.app/
+
+        I have deployed this project using [Streamlit](https://streamlit.io/) for the frontend and [Railway](https://railway.com/) for the backend.
+
+        Streamlit deployment was simple and but I am having issues with `healthcare_server` deployment. I have tested it by creating docker image and testing it locally and that is working perfectly. The following are the deployment images on `railway.com` and 
+
+        - Railway server deployment:
+
+        """)   
+        st.image(_load_image("screenshots/railway_deployment_1.png"), caption="Railway server deployment")
 
-    st.markdown("This is the docker image creation and testing locally:")
-    st.image("screenshots/creating_docker_image.png", caption="Creating docker image")
-    st.image("screenshots/running_docker_image.png", caption="Running docker image")
+        st.markdown("- The main issue is `ffmpeg` not working correctly which is resulting in the APIs not working once deployed:")
+        st.image(_load_image("screenshots/railway_deployment_2.png"), caption="Railway server deployment")
 
-    st.markdown("This is the Healthcare Translation Web App working output:")
-    st.image("screenshots/healtcare_app_1.png", caption="Healthcare Translation Web App working output")
-    st.image("screenshots/healtcare_app_2.png", caption="Healthcare Translation Web App working output")
-    st.image("screenshots/healtcare_app_3.png", caption="Healthcare Translation Web App working output")
+        st.markdown("This is the docker image creation and testing locally:")
+        st.image(_load_image("screenshots/creating_docker_image.png"), caption="Creating docker image")
+        st.image(_load_image("screenshots/running_docker_image.png"), caption="Running docker image")
+
+        st.markdown("This is the Healthcare Translation Web App working output:")
+        st.image(_load_image("screenshots/healtcare_app_1.png"), caption="Healthcare Translation Web App working output")
+        st.image(_load_image("screenshots/healtcare_app_2.png"), caption="Healthcare Translation Web App working output")
+        st.image(_load_image("screenshots/healtcare_app_3.png"), caption="Healthcare Translation Web App working output")
+
+_render_description()
 
 # ================== Initialize Session State ==================
 if "original_transcript" not in st.session_state:
@@ -211,18 +378,36 @@ if "translation" not in st.session_state:
 audio_value = st.audio_input("Record a voice message...")
 if audio_value:
     st.audio(audio_value, format="audio/wav")
-    audio_data = audio_value.read()
+    audio_data = audio_value  # UploadedFile is BytesIO-like, so pass the buffer instead of copying it
     file_name = "recorded_audio.wav"  # Use a default file name
 
     if st.button("Transcribe Audio"):
-        with st.spinner("Transcribing audio... Please wait"):
-            original, checked = transcribe_audio(audio_data, file_name)
-        
-        st.success("Transcription completed!")
-
-        # Store in session state
-        st.session_state.original_transcript = original
-        st.session_state.checked_transcript = checked
+        try:
+            with st.spinner("Transcribing audio... Please wait"):
+                with audio_data.getbuffer() as view:
+                    audio_hash = hashlib.sha1(view).hexdigest()
+                original, checked = _cached_transcribe(audio_hash, file_name, audio_data)
+        except RuntimeError as e:
+            st.error(str(e))
+        else:
+            st.success("Transcription completed!")
+
+            # Store in session state
+            st.session_state.original_transcript = original
+            st.session_state.checked_transcript = checked
+
+            # Start translating the checked transcript with the selected languages
+            # in the background so the "Translate" click can reuse the result.
+            speculative_key = (
+                checked,
+                st.session_state.get("source_lang", "English"),
+                st.session_state.get("target_lang", "English"),
+            )
+            if speculative_key[1] != speculative_key[2]:
+                st.session_state["_pending_xlate"] = (
+                    speculative_key,
+                    _background_pool().submit(_translate_chunked, *speculative_key),
+                )
 
 # ================== Display Transcripts ==================
 st.text_area("Transcription Result (Original)", st.session_state.original_transcript, height=200)
@@ -231,39 +416,68 @@ st.text_area("Checked Transcription (Post-processing: Grammar and Medical Vocabu
 # ================== Translation ==================
 st.header("Translation")
 
-transcript_to_translate = st.selectbox("Select transcript to translate:", ["Original", "Checked"])
-transcript = st.session_state.original_transcript if transcript_to_translate == "Original" else st.session_state.checked_transcript
+# The language selectors stay outside the form so their values reach
+# session_state immediately, which the background translation after
+# transcription relies on.
+col1, col2 = st.columns(2)
+source_lang = col1.selectbox("Select source language:", list(LANG_CODES), key="source_lang")
+target_lang = col2.selectbox("Select target language:", list(LANG_CODES), key="target_lang")
 
-source_lang = st.selectbox("Select source language:", ["English", "Urdu", "Spanish", "French", "German", "Italian", "Japanese", "Korean", "Portuguese", "Russian", "Chinese"])
-target_lang = st.selectbox("Select target language:", ["English", "Urdu", "Spanish", "French", "German", "Italian", "Japanese", "Korean", "Portuguese", "Russian", "Chinese"])
+# The transcript choice only reruns the script when the form is submitted
+with st.form("translate_form"):
+    transcript_to_translate = st.selectbox("Select transcript to translate:", ["Original", "Checked"])
+    submitted = st.form_submit_button("Translate")
 
-if st.button("Translate"):
+transcript = st.session_state.original_transcript if transcript_to_translate == "Original" else st.session_state.checked_transcript
+
+if submitted:
     if not transcript:
         st.warning("Please transcribe an audio file before translating.")
+    elif source_lang == target_lang:
+        # Nothing to translate, so skip the API round-trip
+        st.session_state.translation = transcript
     else:
-        with st.spinner("Translating... Please wait"):
-            st.session_state.translation = translate_transcript(transcript, source_lang, target_lang)
-        
-        st.success("Translation completed!")
+        pending = st.session_state.get("_pending_xlate")
+        try:
+            with st.spinner("Translating... Please wait"):
+                if pending and pending[0] == (transcript, source_lang, target_lang):
+                    st.session_state.translation = pending[1].result()
+                else:
+                    st.session_state.translation = _translate_chunked(transcript, source_lang, target_lang)
+        except RuntimeError as e:
+            # Drop a failed background result so the next click retries the API
+            st.session_state.pop("_pending_xlate", None)
+            st.error(str(e))
+        else:
+            st.success("Translation completed!")
 
 st.text_area("Translation Result", st.session_state.translation, height=200)
 
 # ================== Audio Playback ==================
 if st.session_state.translation:
     if st.button("Speak Translation"):
+        lang_code = LANG_CODES[target_lang]
+        sentences = _split_sentences(st.session_state.translation)
+        mp3_chunks = []
+
+        # Synthesize sentences in parallel and add a player for each one as soon
+        # as it and the sentences before it are ready, so playback can start early.
         with st.spinner("Generating speech... Please wait"):
-            tts = gTTS(text=st.session_state.translation, lang=target_lang[:2].lower())  # Convert target language to short code
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-            tts.save(temp_file.name)
-        
-        st.audio(temp_file.name, format="audio/mp3")
+            with _executor(4) as pool:
+                futures = [pool.submit(_synthesize, sentence, lang_code) for sentence in sentences]
+                for future in futures:
+                    mp3_chunks.append(future.result())
+                    st.audio(mp3_chunks[-1], format="audio/mp3")
+
+        # MP3 frames can be concatenated safely into a single download
+        mp3_bytes = b"".join(mp3_chunks)
+
         st.success("Audio generated!")
 
         # Download the audio file
-        with open(temp_file.name, "rb") as file:
-                    st.download_button(
-                        label="Download Audio",
-                        data=file,
-                        file_name="translated_speech.mp3",
-                        mime="audio/mp3"
-                    )
+        st.download_button(
+            label="Download Audio",
+            data=mp3_bytes,
+            file_name="translated_speech.mp3",
+            mime="audio/mp3"
+        )
@@ -5,4 +5,9 @@ import os
 # Streamlit does not support environment variables
 # API_BASE_URL = os.getenv("API_BASE_URL")
 
-API_BASE_URL = "https://web-production-983ec.up.railway.app"
\ No newline at end of file
+API_BASE_URL = "https://web-production-983ec.up.railway.app"
+
+# On-disk cache for translations and synthesized speech
+CACHE_DIR = "/tmp/hc_cache"
+CACHE_SIZE_LIMIT = 512 * 1024 * 1024  # 512 MB, least recently used entries are evicted first
+CACHE_EXPIRE = 7 * 24 * 60 * 60  # 7 days
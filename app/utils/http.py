@@ -0,0 +1,18 @@
+import httpx
+import streamlit as st
+from utils.config import API_BASE_URL
+
+
+@st.cache_resource(show_spinner=False)
+def client():
+    """
+    Returns a shared HTTP/2 client so API calls reuse pooled connections instead of
+    reconnecting for every request.
+    """
+    return httpx.Client(
+        base_url=API_BASE_URL,
+        http2=True,
+        # Transcribing long recordings can take a while, so allow slower reads
+        timeout=httpx.Timeout(60.0, read=300.0),
+        limits=httpx.Limits(max_keepalive_connections=8),
+    )